@@ -2,13 +2,116 @@
 from __future__ import annotations
 
 import logging
+import voluptuous as vol
 
-# Domain definition moved to climate.py
-DOMAIN = "mitsubishi_heavy_ac"
+from homeassistant.const import EVENT_HOMEASSISTANT_STARTED, EVENT_HOMEASSISTANT_STOP
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    DOMAIN, PLATFORMS,
+    CONF_TRACING, CONF_TRACE_PATH, CONF_MAX_BYTES, CONF_BACKUP_COUNT, CONF_PROFILE_SETUP,
+    DEFAULT_TRACE_PATH, DEFAULT_TRACE_MAX_BYTES, DEFAULT_TRACE_BACKUP_COUNT,
+    SERVICE_SET_TRACING, SERVICE_LEARN_COMMANDS, ATTR_ENABLED,
+)
+from .runtime import get_runtime_data
+from .tracing import Tracer
 
 _LOGGER = logging.getLogger(__name__)
 
+TRACING_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_ENABLED, default=False): cv.boolean,
+    vol.Optional(CONF_TRACE_PATH, default=DEFAULT_TRACE_PATH): cv.string,
+    vol.Optional(CONF_MAX_BYTES, default=DEFAULT_TRACE_MAX_BYTES): cv.positive_int,
+    vol.Optional(CONF_BACKUP_COUNT, default=DEFAULT_TRACE_BACKUP_COUNT): cv.positive_int,
+    vol.Optional(CONF_PROFILE_SETUP, default=False): cv.boolean,
+})
+
+CONFIG_SCHEMA = vol.Schema({
+    DOMAIN: vol.Schema({
+        vol.Optional(CONF_TRACING, default={}): TRACING_SCHEMA,
+    }),
+}, extra=vol.ALLOW_EXTRA)
+
+SET_TRACING_SCHEMA = vol.Schema({
+    vol.Required(ATTR_ENABLED): cv.boolean,
+})
+
+
 async def async_setup(hass, config):
     """Set up the Mitsubishi Heavy AC component."""
-    # Just return True as all setup is handled by the platform
-    return True
\ No newline at end of file
+    # Entities are set up by the climate platform (YAML) or config entries;
+    # the component only owns the integration-wide runtime data.
+    conf = config.get(DOMAIN, {})
+    tracing_conf = conf.get(CONF_TRACING) or TRACING_SCHEMA({})
+
+    runtime = get_runtime_data(hass)
+    tracer = runtime.tracer = Tracer(
+        hass.config.path(tracing_conf[CONF_TRACE_PATH]),
+        tracing_conf[CONF_MAX_BYTES],
+        tracing_conf[CONF_BACKUP_COUNT],
+        tracing_conf[CONF_PROFILE_SETUP],
+    )
+
+    if tracing_conf[ATTR_ENABLED]:
+        tracer.start()
+
+    if tracer.profile_setup and not hass.is_running:
+        # Covers platform and entry setup of every unit until startup is done
+        tracer.start_profile()
+
+        async def async_dump_profile(event):
+            await tracer.async_stop_profile(hass)
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, async_dump_profile)
+
+    async def async_handle_set_tracing(call):
+        """Toggle tracing at runtime."""
+        await tracer.async_set_enabled(hass, call.data[ATTR_ENABLED])
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_TRACING, async_handle_set_tracing, schema=SET_TRACING_SCHEMA
+    )
+
+    async def async_handle_learn_commands(call):
+        """Learn a matrix of codes into a codes/ model file."""
+        # Learning is rare, so its module is only imported when used
+        from .learning import LEARN_COMMANDS_SCHEMA, async_learn_commands
+
+        try:
+            params = LEARN_COMMANDS_SCHEMA(dict(call.data))
+        except vol.Invalid as err:
+            raise HomeAssistantError(f"Invalid learn_commands call: {err}") from err
+        await async_learn_commands(hass, runtime, params)
+
+    hass.services.async_register(DOMAIN, SERVICE_LEARN_COMMANDS, async_handle_learn_commands)
+
+    async def async_shutdown(event):
+        """Stop scheduled transitions and flush pending trace events."""
+        runtime.timer_wheel.async_shutdown()
+        await hass.async_add_executor_job(tracer.stop)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_shutdown)
+
+    return True
+
+
+async def async_setup_entry(hass, entry):
+    """Set up a Mitsubishi Heavy AC unit from a config entry."""
+    # Model tables are loaded once and kept in the runtime data, so reloading
+    # an entry only rebuilds its entity.
+    await get_runtime_data(hass).async_load_models()
+
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    return True
+
+
+async def async_unload_entry(hass, entry):
+    """Unload a config entry, keeping the shared runtime data warm."""
+    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+
+async def async_reload_entry(hass, entry):
+    """Reload a config entry after its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
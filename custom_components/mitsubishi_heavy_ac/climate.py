@@ -2,152 +2,118 @@
 from __future__ import annotations
 
 import logging
+import time
 import voluptuous as vol
 
 from homeassistant.components.climate import ClimateEntity, PLATFORM_SCHEMA
 from homeassistant.components.climate.const import (
     ClimateEntityFeature, HVACMode,
-    FAN_AUTO, FAN_LOW, FAN_MEDIUM, FAN_HIGH,
-    SWING_OFF, SWING_ON,
+    FAN_AUTO, SWING_OFF,
 )
 from homeassistant.const import (
-    CONF_NAME, STATE_ON, STATE_OFF, STATE_UNKNOWN, STATE_UNAVAILABLE, ATTR_TEMPERATURE,
+    CONF_NAME, CONF_HOST, CONF_MAC, STATE_ON, STATE_OFF, STATE_UNKNOWN, STATE_UNAVAILABLE, ATTR_TEMPERATURE,
     PRECISION_TENTHS, PRECISION_HALVES, PRECISION_WHOLE, UnitOfTemperature
 )
 from homeassistant.core import callback
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import entity_platform
 from homeassistant.helpers.restore_state import RestoreEntity
+import homeassistant.util.dt as dt_util
 
-# Constants that were previously in const.py
-DOMAIN = "mitsubishi_heavy_ac"
-DEFAULT_NAME = "Mitsubishi Heavy AC"
-
-CONF_UNIQUE_ID = 'unique_id'
-CONF_TEMPERATURE_SENSOR = "temperature_sensor"
-CONF_HUMIDITY_SENSOR = "humidity_sensor"
-CONF_REMOTE = "remote"
+from .const import (
+    DOMAIN,
+    CONF_UNIQUE_ID, CONF_TEMPERATURE_SENSOR, CONF_HUMIDITY_SENSOR, CONF_REMOTE, CONF_MODEL,
+    CONF_TRANSMIT_MODE, ATTR_TRANSMIT_LATENCY,
+    SERVICE_SCHEDULE_TRANSITION, SERVICE_CLEAR_SCHEDULE,
+    ATTR_AT, ATTR_DAILY, ATTR_UPCOMING_TRANSITIONS,
+)
+from .models import DEFAULT_MODEL
+from .runtime import get_runtime_data
+from .scheduler import ScheduledTransition, parse_restored
+from .transmit import TRANSMIT_DIRECT, TRANSMIT_MODES, TRANSMIT_SERVICE, TransmitStats
 
 _LOGGER = logging.getLogger(__name__)
 
-# Example device data - this would typically come from a JSON file or other configuration
-# In a real implementation, this could be expanded to include different models or customization options
-DEVICE_DATA = {
-    "srk-zsx": {
-        "name": "Mitsubishi Heavy SRK-ZSX",
-        "min_temp": 16,
-        "max_temp": 30,
-        "precision": 1.0,
-        "hvac_modes": [HVACMode.OFF, HVACMode.HEAT, HVACMode.COOL, HVACMode.AUTO, HVACMode.DRY, HVACMode.FAN_ONLY],
-        "fan_modes": [FAN_AUTO, FAN_LOW, FAN_MEDIUM, FAN_HIGH],
-        "swing_modes": [SWING_OFF, SWING_ON],
-        "commands": {
-            # Example IR/RF commands for various operations - these would be the actual codes for your remote
-            "off": "OFF_COMMAND",
-            "heat": {
-                "16": "HEAT_16_COMMAND",
-                "17": "HEAT_17_COMMAND",
-                "18": "HEAT_18_COMMAND",
-                "19": "HEAT_19_COMMAND",
-                "20": "HEAT_20_COMMAND",
-                "21": "HEAT_21_COMMAND",
-                "22": "HEAT_22_COMMAND",
-                "23": "HEAT_23_COMMAND",
-                "24": "HEAT_24_COMMAND",
-                "25": "HEAT_25_COMMAND",
-                "26": "HEAT_26_COMMAND",
-                "27": "HEAT_27_COMMAND",
-                "28": "HEAT_28_COMMAND",
-                "29": "HEAT_29_COMMAND",
-                "30": "HEAT_30_COMMAND"
-            },
-            "cool": {
-                "16": "COOL_16_COMMAND",
-                "17": "COOL_17_COMMAND",
-                "18": "COOL_18_COMMAND",
-                "19": "COOL_19_COMMAND",
-                "20": "COOL_20_COMMAND",
-                "21": "COOL_21_COMMAND",
-                "22": "COOL_22_COMMAND",
-                "23": "COOL_23_COMMAND",
-                "24": "COOL_24_COMMAND",
-                "25": "COOL_25_COMMAND",
-                "26": "COOL_26_COMMAND",
-                "27": "COOL_27_COMMAND",
-                "28": "COOL_28_COMMAND",
-                "29": "COOL_29_COMMAND",
-                "30": "COOL_30_COMMAND"
-            },
-            "auto": {
-                "16": "AUTO_16_COMMAND",
-                # ... more commands
-            },
-            "dry": {
-                "16": "DRY_16_COMMAND",
-                # ... more commands
-            },
-            "fan_only": "FAN_ONLY_COMMAND",
-            "fan_modes": {
-                "auto": "FAN_AUTO_COMMAND",
-                "low": "FAN_LOW_COMMAND",
-                "medium": "FAN_MEDIUM_COMMAND",
-                "high": "FAN_HIGH_COMMAND"
-            },
-            "swing_modes": {
-                "off": "SWING_OFF_COMMAND",
-                "on": "SWING_ON_COMMAND"
-            }
-        }
-    },
-    "srk-zsp": {
-        "name": "Mitsubishi Heavy SRK-ZSP",
-        "min_temp": 18,
-        "max_temp": 30,
-        "precision": 1.0,
-        "hvac_modes": [HVACMode.OFF, HVACMode.HEAT, HVACMode.COOL, HVACMode.AUTO, HVACMode.DRY],
-        "fan_modes": [FAN_AUTO, FAN_LOW, FAN_MEDIUM, FAN_HIGH],
-        "swing_modes": [SWING_OFF, SWING_ON],
-        "commands": {
-            # Similar command structure but with different codes
-        }
-    }
-}
-
-# Default model to use if not specified
-DEFAULT_MODEL = "srk-zsx"
+def _has_transmitter(config):
+    """Require a remote unless packets are sent directly to a Broadlink device."""
+    direct = config[CONF_TRANSMIT_MODE] == TRANSMIT_DIRECT and CONF_HOST in config
+    if not (config.get(CONF_REMOTE) or direct):
+        raise vol.Invalid(
+            f"{CONF_REMOTE} is required unless {CONF_TRANSMIT_MODE} is {TRANSMIT_DIRECT} "
+            f"with {CONF_HOST} and {CONF_MAC}"
+        )
+    return config
 
 # Platform schema for direct climate configuration
-PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
+PLATFORM_SCHEMA = vol.All(PLATFORM_SCHEMA.extend({
     vol.Required(CONF_UNIQUE_ID): cv.string,
     vol.Optional(CONF_NAME): cv.string,
     vol.Optional(CONF_REMOTE): cv.entity_id,
     vol.Optional(CONF_TEMPERATURE_SENSOR): cv.entity_id,
     vol.Optional(CONF_HUMIDITY_SENSOR): cv.entity_id,
-    vol.Optional("model", default=DEFAULT_MODEL): cv.string,
-})
+    vol.Optional(CONF_MODEL, default=DEFAULT_MODEL): cv.string,
+    vol.Inclusive(CONF_HOST, "direct"): cv.string,
+    vol.Inclusive(CONF_MAC, "direct"): cv.string,
+    vol.Optional(CONF_TRANSMIT_MODE, default=TRANSMIT_SERVICE): vol.In(TRANSMIT_MODES),
+}), _has_transmitter)
+
+SCHEDULE_TRANSITION_SCHEMA = {
+    vol.Required(ATTR_AT): cv.time,
+    vol.Required("hvac_mode"): vol.Coerce(HVACMode),
+    vol.Optional(ATTR_TEMPERATURE): vol.Coerce(float),
+    vol.Optional("fan_mode"): cv.string,
+    vol.Optional(ATTR_DAILY, default=False): cv.boolean,
+}
 
 async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
     """Set up the Mitsubishi Heavy AC platform from config."""
-    # Get configuration values
-    unique_id = config.get(CONF_UNIQUE_ID)
-    model = config.get("model", DEFAULT_MODEL)
-    remote = config.get(CONF_REMOTE)
-    temp_sensor = config.get(CONF_TEMPERATURE_SENSOR)
-    humidity_sensor = config.get(CONF_HUMIDITY_SENSOR)
-    
-    # Get device data for the specified model, or use default if not found
-    device_data = DEVICE_DATA.get(model, DEVICE_DATA[DEFAULT_MODEL])
-    
-    # Use configured name or fall back to device data name
-    name = config.get(CONF_NAME, device_data["name"])
-    
-    _LOGGER.debug(f"Setting up Mitsubishi Heavy AC with model: {model}, name: {name}")
+    await _async_setup_unit(hass, config, config.get(CONF_UNIQUE_ID), async_add_entities)
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    """Set up the Mitsubishi Heavy AC unit of a config entry."""
+    # Options replace the unit settings wholesale so cleared fields stay cleared
+    config = {CONF_NAME: entry.data[CONF_NAME], **(entry.options or entry.data)}
+    await _async_setup_unit(hass, config, entry.entry_id, async_add_entities)
+
+async def _async_setup_unit(hass, config, unique_id, async_add_entities):
+    """Create the climate entity for one unit and register its services."""
+    runtime = get_runtime_data(hass)
+    with runtime.tracer.span("setup_platform", cat="setup", root=True, unique_id=unique_id):
+        # Get configuration values
+        model = config.get(CONF_MODEL, DEFAULT_MODEL)
+        remote = config.get(CONF_REMOTE)
+        temp_sensor = config.get(CONF_TEMPERATURE_SENSOR)
+        humidity_sensor = config.get(CONF_HUMIDITY_SENSOR)
+        host = config.get(CONF_HOST)
+        mac = config.get(CONF_MAC)
+        transmit_mode = config.get(CONF_TRANSMIT_MODE, TRANSMIT_SERVICE)
+        
+        await runtime.async_load_models()
+        
+        # Use configured name or fall back to device data name
+        name = config.get(CONF_NAME) or runtime.get_model(model)["name"]
+        
+        _LOGGER.debug(f"Setting up Mitsubishi Heavy AC with model: {model}, name: {name}")
+        
+        async_add_entities([
+            MitsubishiHeavyClimate(
+                hass, name, unique_id, model, remote, temp_sensor, humidity_sensor,
+                host, mac, transmit_mode
+            )
+        ])
     
-    async_add_entities([
-        MitsubishiHeavyClimate(
-            hass, name, unique_id, device_data, remote, temp_sensor, humidity_sensor
-        )
-    ])
+    # Entity services target every entity of the integration, whichever
+    # platform registered them, so they only need registering once
+    if hass.services.has_service(DOMAIN, SERVICE_SCHEDULE_TRANSITION):
+        return
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_SCHEDULE_TRANSITION, SCHEDULE_TRANSITION_SCHEMA, "async_schedule_transition"
+    )
+    platform.async_register_entity_service(
+        SERVICE_CLEAR_SCHEDULE, {}, "async_clear_schedule"
+    )
 
 class MitsubishiHeavyClimate(ClimateEntity, RestoreEntity):
     """Representation of a Mitsubishi Heavy AC unit."""
@@ -157,24 +123,33 @@ class MitsubishiHeavyClimate(ClimateEntity, RestoreEntity):
         hass,
         name,
         unique_id,
-        device_data,
+        model,
         remote=None,
         temperature_sensor=None,
-        humidity_sensor=None
+        humidity_sensor=None,
+        host=None,
+        mac=None,
+        transmit_mode=TRANSMIT_SERVICE
     ):
         """Initialize the climate device."""
         self.hass = hass
         self._name = name
         self._unique_id = unique_id
-        self._device_data = device_data  # Store device data for reference
+        self._runtime = get_runtime_data(hass)
+        self._model = model
         self._remote = remote
         self._temperature_sensor_entity_id = temperature_sensor
         self._humidity_sensor_entity_id = humidity_sensor
         
-        # Load device specific configurations from device_data
-        self._min_temp = device_data["min_temp"]
-        self._max_temp = device_data["max_temp"]
-        self._precision = device_data["precision"]
+        # Direct mode sends packets straight to a pooled Broadlink device and
+        # falls back to the remote service when that fails
+        self._host = host
+        self._mac = mac
+        self._direct = transmit_mode == TRANSMIT_DIRECT and bool(host and mac)
+        self._can_send = bool(remote or self._direct)
+        self._transmit_stats = TransmitStats()
+        
+        self._load_model()
         
         self._hvac_mode = HVACMode.OFF
         self._current_temperature = None
@@ -183,36 +158,73 @@ class MitsubishiHeavyClimate(ClimateEntity, RestoreEntity):
         self._fan_mode = FAN_AUTO
         self._swing_mode = SWING_OFF
         
+        self._tracer = self._runtime.tracer
+        self._timer_wheel = self._runtime.timer_wheel
+        self._transitions = []
+    
+    def _load_model(self):
+        """Load the device specific configuration of the model."""
+        device_data = self._runtime.get_model(self._model)
+        self._device_data = device_data  # Store device data for reference
+        self._min_temp = device_data["min_temp"]
+        self._max_temp = device_data["max_temp"]
+        self._precision = device_data["precision"]
+        
         # Load available modes from device data
-        self._hvac_modes = device_data["hvac_modes"]
+        self._hvac_modes = [HVACMode(mode) for mode in device_data["hvac_modes"]]
         self._fan_modes = device_data["fan_modes"]
         self._swing_modes = device_data["swing_modes"]
         
-        # Store commands for controlling the AC
-        self._commands = device_data["commands"]
+        # Commands for controlling the AC are resolved by the encoder shared
+        # by all units of this model
+        self._encoder = self._runtime.get_encoder(self._model)
+    
+    @callback
+    def _async_models_reloaded(self):
+        """Pick up the reloaded model and re-encode pending transitions."""
+        self._load_model()
+        for transition in list(self._transitions):
+            try:
+                transition.commands = self._encode_transition(
+                    transition.hvac_mode, transition.temperature, transition.fan_mode
+                )
+            except HomeAssistantError as err:
+                _LOGGER.warning(
+                    "Dropping transition at %s for %s: %s", transition.at, self.entity_id, err
+                )
+                self._timer_wheel.cancel(transition)
+                self._transitions.remove(transition)
+        self.async_write_ha_state()
     
     async def async_added_to_hass(self):
         """Run when entity about to be added."""
         await super().async_added_to_hass()
         
-        # Add temperature sensor state listener if configured
-        if self._temperature_sensor_entity_id:
-            self.hass.helpers.event.async_track_state_change(
-                self._temperature_sensor_entity_id, 
-                self._async_temperature_sensor_changed
-            )
+        with self._tracer.span("add_entity", cat="setup", root=True, entity_id=self.entity_id):
+            self.async_on_remove(self._runtime.async_listen_models(self._async_models_reloaded))
+            
+            # Add temperature sensor state listener if configured
+            if self._temperature_sensor_entity_id:
+                self.async_on_remove(self._runtime.sensors.async_subscribe(
+                    self._temperature_sensor_entity_id, 
+                    self._async_temperature_sensor_changed
+                ))
 
-        # Add humidity sensor state listener if configured
-        if self._humidity_sensor_entity_id:
-            self.hass.helpers.event.async_track_state_change(
-                self._humidity_sensor_entity_id, 
-                self._async_humidity_sensor_changed
-            )
+            # Add humidity sensor state listener if configured
+            if self._humidity_sensor_entity_id:
+                self.async_on_remove(self._runtime.sensors.async_subscribe(
+                    self._humidity_sensor_entity_id, 
+                    self._async_humidity_sensor_changed
+                ))
             
-        # Update temperature and humidity from sensors if available
-        await self._async_update_sensors()
-        
-        # Restore previous state if available
+            # Both only read in-memory state (the state machine and the restore
+            # cache), so there is nothing to overlap; HA already adds the
+            # entities of all units concurrently
+            await self._async_update_sensors()
+            await self._async_restore_state()
+    
+    async def _async_restore_state(self):
+        """Restore the previous state and schedule if available."""
         last_state = await self.async_get_last_state()
         
         if last_state is not None:
@@ -222,6 +234,18 @@ class MitsubishiHeavyClimate(ClimateEntity, RestoreEntity):
             self._target_temperature = last_attributes.get(ATTR_TEMPERATURE, self._target_temperature)
             self._fan_mode = last_attributes.get('fan_mode', self._fan_mode)
             self._swing_mode = last_attributes.get('swing_mode', self._swing_mode)
+            
+            for transition in last_attributes.get(ATTR_UPCOMING_TRANSITIONS) or []:
+                self._restore_transition(transition)
+    
+    async def async_will_remove_from_hass(self):
+        """Cancel scheduled transitions when the entity is removed."""
+        # Lets RestoreEntity store the current state, so a reloaded entry
+        # restores it instead of the snapshot taken at startup
+        await super().async_will_remove_from_hass()
+        for transition in self._transitions:
+            self._timer_wheel.cancel(transition)
+        self._transitions = []
     
     async def _async_update_sensors(self):
         """Update temperature and humidity from sensors if available."""
@@ -241,7 +265,8 @@ class MitsubishiHeavyClimate(ClimateEntity, RestoreEntity):
                 except ValueError:
                     _LOGGER.error("Unable to update from humidity sensor: %s", humidity_state.state)
     
-    async def _async_temperature_sensor_changed(self, entity_id, old_state, new_state):
+    @callback
+    def _async_temperature_sensor_changed(self, new_state):
         """Handle temperature sensor state changes."""
         if new_state is None or new_state.state in ('unavailable', 'unknown'):
             return
@@ -252,7 +277,8 @@ class MitsubishiHeavyClimate(ClimateEntity, RestoreEntity):
         except ValueError:
             _LOGGER.error("Unable to update from temperature sensor: %s", new_state.state)
     
-    async def _async_humidity_sensor_changed(self, entity_id, old_state, new_state):
+    @callback
+    def _async_humidity_sensor_changed(self, new_state):
         """Handle humidity sensor state changes."""
         if new_state is None or new_state.state in ('unavailable', 'unknown'):
             return
@@ -338,6 +364,24 @@ class MitsubishiHeavyClimate(ClimateEntity, RestoreEntity):
         """Return the temperature we try to reach."""
         return self._target_temperature
     
+    @property
+    def emitter(self):
+        """Return the key of the emitter this unit transmits through."""
+        if self._direct:
+            return self._host
+        return self._remote or self._unique_id
+    
+    @property
+    def extra_state_attributes(self):
+        """Return upcoming scheduled transitions."""
+        return {
+            ATTR_UPCOMING_TRANSITIONS: [
+                transition.as_dict()
+                for transition in sorted(self._transitions, key=lambda t: t.fire_time)
+            ],
+            ATTR_TRANSMIT_LATENCY: self._transmit_stats.as_dict(),
+        }
+    
     @property
     def supported_features(self):
         """Return the list of supported features."""
@@ -347,106 +391,209 @@ class MitsubishiHeavyClimate(ClimateEntity, RestoreEntity):
             | ClimateEntityFeature.SWING_MODE
         )
     
+    def _ready_to_send(self):
+        """Return True if commands can be sent, logging an error otherwise."""
+        if not self._can_send:
+            _LOGGER.error(
+                "%s has no remote entity or direct Broadlink device, state changes are not sent",
+                self.entity_id
+            )
+        return self._can_send
+    
+    async def _async_send_command(self, command):
+        """Send a command and wait for completion.
+        
+        In direct mode pre-encoded packets go straight to the Broadlink device;
+        learned command names and failed direct sends use the remote service,
+        as do all sends while the device backs off after a failure.
+        """
+        if self._direct:
+            packet = self._encoder.packet(command)
+            if packet is not None and self._remote and self._runtime.emitters.is_backing_off(self._host, self._mac):
+                self._transmit_stats.fallbacks += 1
+            elif packet is not None:
+                started = time.perf_counter()
+                try:
+                    with self._tracer.span("transmit.direct", host=self._host):
+                        await self._runtime.emitters.async_send_packet(self._host, self._mac, packet)
+                except Exception as e:
+                    if not self._remote:
+                        raise HomeAssistantError(f"Failed to send to Broadlink device at {self._host}: {e}") from e
+                    _LOGGER.warning("Direct send to %s failed, using remote service: %s", self._host, e)
+                    self._transmit_stats.fallbacks += 1
+                else:
+                    self._transmit_stats.record(TRANSMIT_DIRECT, started)
+                    return
+        
+        if not self._remote:
+            _LOGGER.error(f"Command {command} is not a packet and no remote is configured")
+            return
+        
+        _LOGGER.debug(f"Sending command: {command} via remote: {self._remote}")
+        service_data = {
+            "entity_id": self._remote,
+            "command": command
+        }
+        started = time.perf_counter()
+        with self._tracer.span("remote.send_command", command=command):
+            await self.hass.services.async_call(
+                "remote", "send_command", service_data, blocking=True
+            )
+        self._transmit_stats.record(TRANSMIT_SERVICE, started)
+    
+    async def _async_write_state(self):
+        """Write the new state to Home Assistant."""
+        with self._tracer.span("write_state"):
+            await self.async_update_ha_state()
+    
     async def async_set_hvac_mode(self, hvac_mode):
         """Set new target hvac mode."""
-        self._hvac_mode = hvac_mode
-        
-        # Send command through the configured remote
-        if self._remote:
-            command = None
+        with self._tracer.span("set_hvac_mode", root=True, entity_id=self.entity_id, hvac_mode=hvac_mode):
+            self._hvac_mode = hvac_mode
             
-            # Get the appropriate command based on the mode and temperature
-            if hvac_mode == HVACMode.OFF:
-                command = self._commands.get("off")
-            elif hvac_mode in (HVACMode.HEAT, HVACMode.COOL, HVACMode.AUTO, HVACMode.DRY):
-                # Get the command for the current mode and temperature
-                mode_commands = self._commands.get(hvac_mode.lower(), {})
-                temp_str = str(int(self._target_temperature))
-                command = mode_commands.get(temp_str)
-            elif hvac_mode == HVACMode.FAN_ONLY:
-                command = self._commands.get("fan_only")
+            # Send command through the configured remote
+            if self._ready_to_send():
+                # Get the appropriate command based on the mode and temperature
+                with self._tracer.span("encode"):
+                    command = self._encoder.mode_command(hvac_mode, self._target_temperature, self._fan_mode)
+                    
+                if command:
+                    await self._async_send_command(command)
+                else:
+                    _LOGGER.error(f"No command found for mode: {hvac_mode} at temp: {self._target_temperature}")
                 
-            if command:
-                _LOGGER.debug(f"Sending command: {command} via remote: {self._remote}")
-                service_data = {
-                    "entity_id": self._remote,
-                    "command": command
-                }
-                await self.hass.services.async_call(
-                    "remote", "send_command", service_data
-                )
-            else:
-                _LOGGER.error(f"No command found for mode: {hvac_mode} at temp: {self._target_temperature}")
-            
-        await self.async_update_ha_state()
+            await self._async_write_state()
     
     async def async_set_temperature(self, **kwargs):
         """Set new target temperature."""
         if ATTR_TEMPERATURE in kwargs:
-            self._target_temperature = kwargs[ATTR_TEMPERATURE]
-            
-            # If the unit is on, send the command for the new temperature
-            if self._hvac_mode != HVACMode.OFF and self._remote:
-                mode_commands = self._commands.get(self._hvac_mode.lower(), {})
-                temp_str = str(int(self._target_temperature))
-                command = mode_commands.get(temp_str)
+            with self._tracer.span("set_temperature", root=True, entity_id=self.entity_id, temperature=kwargs[ATTR_TEMPERATURE]):
+                self._target_temperature = kwargs[ATTR_TEMPERATURE]
                 
-                if command:
-                    _LOGGER.debug(f"Sending temperature command: {command}")
-                    service_data = {
-                        "entity_id": self._remote,
-                        "command": command
-                    }
-                    await self.hass.services.async_call(
-                        "remote", "send_command", service_data
-                    )
-                else:
-                    _LOGGER.error(f"No command found for mode: {self._hvac_mode} at temp: {self._target_temperature}")
+                # If the unit is on, send the command for the new temperature
+                if self._hvac_mode != HVACMode.OFF and self._ready_to_send():
+                    with self._tracer.span("encode"):
+                        command = self._encoder.mode_command(self._hvac_mode, self._target_temperature, self._fan_mode)
                     
-            await self.async_update_ha_state()
+                    if command:
+                        await self._async_send_command(command)
+                    else:
+                        _LOGGER.error(f"No command found for mode: {self._hvac_mode} at temp: {self._target_temperature}")
+                        
+                await self._async_write_state()
     
     async def async_set_fan_mode(self, fan_mode):
         """Set new target fan mode."""
-        self._fan_mode = fan_mode
-        
-        # Send fan mode command if remote is configured
-        if self._remote:
-            fan_commands = self._commands.get("fan_modes", {})
-            command = fan_commands.get(fan_mode.lower())
+        with self._tracer.span("set_fan_mode", root=True, entity_id=self.entity_id, fan_mode=fan_mode):
+            self._fan_mode = fan_mode
             
-            if command:
-                _LOGGER.debug(f"Sending fan mode command: {command}")
-                service_data = {
-                    "entity_id": self._remote,
-                    "command": command
-                }
-                await self.hass.services.async_call(
-                    "remote", "send_command", service_data
-                )
-            else:
-                _LOGGER.error(f"No command found for fan mode: {fan_mode}")
+            # Send fan mode command if remote is configured
+            if self._ready_to_send():
+                with self._tracer.span("encode"):
+                    command = self._encoder.fan_command(fan_mode, self._hvac_mode, self._target_temperature)
                 
-        await self.async_update_ha_state()
+                if command:
+                    await self._async_send_command(command)
+                else:
+                    _LOGGER.error(f"No command found for fan mode: {fan_mode}")
+                    
+            await self._async_write_state()
     
     async def async_set_swing_mode(self, swing_mode):
         """Set new target swing operation."""
-        self._swing_mode = swing_mode
-        
-        # Send swing mode command if remote is configured
-        if self._remote:
-            swing_commands = self._commands.get("swing_modes", {})
-            command = swing_commands.get(swing_mode.lower())
+        with self._tracer.span("set_swing_mode", root=True, entity_id=self.entity_id, swing_mode=swing_mode):
+            self._swing_mode = swing_mode
             
-            if command:
-                _LOGGER.debug(f"Sending swing mode command: {command}")
-                service_data = {
-                    "entity_id": self._remote,
-                    "command": command
-                }
-                await self.hass.services.async_call(
-                    "remote", "send_command", service_data
-                )
-            else:
-                _LOGGER.error(f"No command found for swing mode: {swing_mode}")
+            # Send swing mode command if remote is configured
+            if self._ready_to_send():
+                with self._tracer.span("encode"):
+                    command = self._encoder.swing_command(swing_mode)
                 
-        await self.async_update_ha_state()
\ No newline at end of file
+                if command:
+                    await self._async_send_command(command)
+                else:
+                    _LOGGER.error(f"No command found for swing mode: {swing_mode}")
+                    
+            await self._async_write_state()
+    
+    def _encode_transition(self, hvac_mode, temperature, fan_mode):
+        """Resolve the commands for a target state, in send order."""
+        if not self._can_send:
+            return ()
+        try:
+            return self._encoder.encode(hvac_mode, temperature, fan_mode)
+        except LookupError as err:
+            raise HomeAssistantError(str(err)) from err
+    
+    def _add_transition(self, at, hvac_mode, temperature, fan_mode, daily, first_fire=None):
+        """Pre-encode a transition and hand it to the timer wheel."""
+        if temperature is None:
+            temperature = self._target_temperature
+        commands = self._encode_transition(hvac_mode, temperature, fan_mode)
+        transition = ScheduledTransition(
+            self, at, hvac_mode, temperature, fan_mode, commands, daily
+        )
+        self._timer_wheel.schedule(transition, first_fire)
+        self._transitions.append(transition)
+        return transition
+    
+    def _restore_transition(self, value):
+        """Re-create a transition saved in the last state."""
+        at, fire_time = parse_restored(value)
+        if at is None:
+            return
+        if fire_time is not None and fire_time <= dt_util.utcnow():
+            if not value.get(ATTR_DAILY):
+                return
+            fire_time = None
+        try:
+            self._add_transition(
+                at,
+                HVACMode(value["hvac_mode"]),
+                value.get("temperature"),
+                value.get("fan_mode"),
+                value.get(ATTR_DAILY, False),
+                fire_time,
+            )
+        except (HomeAssistantError, KeyError, ValueError) as err:
+            _LOGGER.warning("Dropping restored transition for %s: %s", self.entity_id, err)
+    
+    async def async_schedule_transition(self, at, hvac_mode, temperature=None, fan_mode=None, daily=False):
+        """Schedule a transition to a target state at a local time of day."""
+        transition = self._add_transition(at, hvac_mode, temperature, fan_mode, daily)
+        _LOGGER.debug(
+            "Scheduled %s for %s at %s (%d commands)",
+            hvac_mode, self.entity_id, transition.fire_time, len(transition.commands)
+        )
+        self.async_write_ha_state()
+    
+    async def async_clear_schedule(self):
+        """Cancel all scheduled transitions."""
+        for transition in self._transitions:
+            self._timer_wheel.cancel(transition)
+        self._transitions = []
+        self.async_write_ha_state()
+    
+    async def async_fire_transition(self, transition):
+        """Send the pre-encoded commands of a due transition."""
+        with self._tracer.span("scheduled_transition", root=True, entity_id=self.entity_id, hvac_mode=transition.hvac_mode):
+            if not transition.daily and transition in self._transitions:
+                self._transitions.remove(transition)
+            
+            # Nothing awaits this task, so a failed send is logged here and the
+            # target state is still recorded
+            try:
+                for command in transition.commands:
+                    await self._async_send_command(command)
+            except HomeAssistantError as err:
+                _LOGGER.error(
+                    "Scheduled transition to %s at %s failed for %s: %s",
+                    transition.hvac_mode, transition.at, self.entity_id, err
+                )
+            
+            self._hvac_mode = transition.hvac_mode
+            self._target_temperature = transition.temperature
+            if transition.fan_mode is not None:
+                self._fan_mode = transition.fan_mode
+            
+            await self._async_write_state()
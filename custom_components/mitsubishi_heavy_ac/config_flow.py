@@ -0,0 +1,116 @@
+"""Config flow for the Mitsubishi Heavy AC integration."""
+from __future__ import annotations
+
+import logging
+import voluptuous as vol
+
+from homeassistant import config_entries
+from homeassistant.const import CONF_NAME, CONF_HOST, CONF_MAC
+from homeassistant.core import callback
+from homeassistant.helpers import selector
+from homeassistant.util import slugify
+
+from .const import (
+    DOMAIN, DEFAULT_NAME,
+    CONF_MODEL, CONF_REMOTE, CONF_TEMPERATURE_SENSOR, CONF_HUMIDITY_SENSOR,
+    CONF_TRANSMIT_MODE,
+)
+from .models import DEFAULT_MODEL
+from .runtime import get_runtime_data
+from .transmit import TRANSMIT_DIRECT, TRANSMIT_MODES, TRANSMIT_SERVICE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _unit_schema(models, defaults):
+    """Return the schema shared by the user step and the options flow."""
+    return {
+        vol.Required(CONF_MODEL, default=defaults.get(CONF_MODEL, DEFAULT_MODEL)): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=sorted(models), mode=selector.SelectSelectorMode.DROPDOWN
+            )
+        ),
+        vol.Optional(
+            CONF_REMOTE, description={"suggested_value": defaults.get(CONF_REMOTE)}
+        ): selector.EntitySelector(selector.EntitySelectorConfig(domain="remote")),
+        vol.Optional(
+            CONF_TEMPERATURE_SENSOR, description={"suggested_value": defaults.get(CONF_TEMPERATURE_SENSOR)}
+        ): selector.EntitySelector(selector.EntitySelectorConfig(domain="sensor")),
+        vol.Optional(
+            CONF_HUMIDITY_SENSOR, description={"suggested_value": defaults.get(CONF_HUMIDITY_SENSOR)}
+        ): selector.EntitySelector(selector.EntitySelectorConfig(domain="sensor")),
+        vol.Optional(CONF_HOST, description={"suggested_value": defaults.get(CONF_HOST)}): str,
+        vol.Optional(CONF_MAC, description={"suggested_value": defaults.get(CONF_MAC)}): str,
+        vol.Required(
+            CONF_TRANSMIT_MODE, default=defaults.get(CONF_TRANSMIT_MODE, TRANSMIT_SERVICE)
+        ): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=TRANSMIT_MODES, mode=selector.SelectSelectorMode.DROPDOWN
+            )
+        ),
+    }
+
+
+def _validate_unit(user_input):
+    """Return form errors for a unit that has no way to send commands."""
+    host, mac = user_input.get(CONF_HOST), user_input.get(CONF_MAC)
+    if bool(host) != bool(mac):
+        return {"base": "host_mac_pair"}
+    direct = user_input.get(CONF_TRANSMIT_MODE) == TRANSMIT_DIRECT and host
+    if not (user_input.get(CONF_REMOTE) or direct):
+        return {"base": "no_transmitter"}
+    return {}
+
+
+class MitsubishiHeavyConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
+    """Handle a config flow for a Mitsubishi Heavy AC unit."""
+
+    VERSION = 1
+
+    async def async_step_user(self, user_input=None):
+        """Handle the initial step."""
+        errors = {}
+        if user_input is not None:
+            await self.async_set_unique_id(slugify(user_input[CONF_NAME]))
+            self._abort_if_unique_id_configured()
+            errors = _validate_unit(user_input)
+            if not errors:
+                return self.async_create_entry(title=user_input[CONF_NAME], data=user_input)
+
+        defaults = user_input or {}
+        models = await get_runtime_data(self.hass).async_load_models()
+        schema = {vol.Required(CONF_NAME, default=defaults.get(CONF_NAME, DEFAULT_NAME)): str}
+        schema.update(_unit_schema(models, defaults))
+        return self.async_show_form(
+            step_id="user", data_schema=vol.Schema(schema), errors=errors
+        )
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow."""
+        return MitsubishiHeavyOptionsFlow(config_entry)
+
+
+class MitsubishiHeavyOptionsFlow(config_entries.OptionsFlow):
+    """Change the remote, sensors or model of a configured unit."""
+
+    def __init__(self, config_entry):
+        """Initialize the options flow."""
+        # Home Assistant provides config_entry as a read-only property since
+        # 2024.11, so keep our own reference under a private name
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Manage the options."""
+        errors = {}
+        if user_input is not None:
+            errors = _validate_unit(user_input)
+            if not errors:
+                return self.async_create_entry(title="", data=user_input)
+
+        models = await get_runtime_data(self.hass).async_load_models()
+        defaults = user_input or {**self._entry.data, **self._entry.options}
+        return self.async_show_form(
+            step_id="init", data_schema=vol.Schema(_unit_schema(models, defaults)), errors=errors
+        )
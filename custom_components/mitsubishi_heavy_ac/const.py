@@ -0,0 +1,47 @@
+"""Constants for the Mitsubishi Heavy AC integration."""
+
+DOMAIN = "mitsubishi_heavy_ac"
+DEFAULT_NAME = "Mitsubishi Heavy AC"
+
+CONF_UNIQUE_ID = 'unique_id'
+CONF_TEMPERATURE_SENSOR = "temperature_sensor"
+CONF_HUMIDITY_SENSOR = "humidity_sensor"
+CONF_REMOTE = "remote"
+CONF_MODEL = "model"
+CONF_TRANSMIT_MODE = "transmit_mode"
+
+PLATFORMS = ["climate"]
+
+# Tracing options (integration level YAML)
+CONF_TRACING = "tracing"
+CONF_TRACE_PATH = "path"
+CONF_MAX_BYTES = "max_bytes"
+CONF_BACKUP_COUNT = "backup_count"
+CONF_PROFILE_SETUP = "profile_setup"
+
+DEFAULT_TRACE_PATH = "mitsubishi_heavy_ac_trace.json"
+DEFAULT_TRACE_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_TRACE_BACKUP_COUNT = 3
+
+SERVICE_SET_TRACING = "set_tracing"
+ATTR_ENABLED = "enabled"
+
+# Scheduled transitions
+SERVICE_SCHEDULE_TRANSITION = "schedule_transition"
+SERVICE_CLEAR_SCHEDULE = "clear_schedule"
+ATTR_AT = "at"
+ATTR_DAILY = "daily"
+ATTR_UPCOMING_TRANSITIONS = "upcoming_transitions"
+
+ATTR_TRANSMIT_LATENCY = "transmit_latency"
+
+# Bulk code learning
+SERVICE_LEARN_COMMANDS = "learn_commands"
+ATTR_DEVICE = "device"
+ATTR_HVAC_MODES = "hvac_modes"
+ATTR_FAN_MODES = "fan_modes"
+ATTR_MIN_TEMP = "min_temp"
+ATTR_MAX_TEMP = "max_temp"
+ATTR_INCLUDE_OFF = "include_off"
+ATTR_TIMEOUT = "timeout"
+ATTR_RESTART = "restart"
@@ -0,0 +1,371 @@
+"""Guided bulk learning of IR codes into a codes/ model file.
+
+A session walks the mode x temperature (x fan) matrix, captures one code
+per slot and streams each result into codes/<model>.json. Progress is
+checkpointed in HA storage after every slot, so calling the service again
+for the same model resumes where the previous session stopped.
+
+Codes are captured straight from a pooled Broadlink device when host and
+mac are given. With only a remote entity, slots are learned with
+remote.learn_command under their slot name and the packet is read back
+from the Broadlink integration's code storage. Either way every capture is
+decoded and rejected when truncated or identical to another slot, and the
+packet itself is written to the model file.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import time
+
+import voluptuous as vol
+
+from homeassistant.components import persistent_notification
+from homeassistant.const import CONF_NAME, CONF_HOST, CONF_MAC
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    CONF_MODEL, CONF_REMOTE,
+    ATTR_DEVICE, ATTR_HVAC_MODES, ATTR_FAN_MODES, ATTR_MIN_TEMP, ATTR_MAX_TEMP,
+    ATTR_INCLUDE_OFF, ATTR_TIMEOUT, ATTR_RESTART,
+)
+from .models import CODES_DIR
+from .transmit import PACKET_PREFIX
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+LEARN_POLL_INTERVAL = 1
+MAX_ATTEMPTS = 3
+# The Broadlink remote saves learned codes 15 seconds after learning them
+REMOTE_STORAGE_VERSION = 1
+REMOTE_SAVE_TIMEOUT = 20
+# A Mitsubishi Heavy frame is well over a hundred pulses; anything much
+# shorter is a truncated capture or a stray signal
+MIN_PULSES = 32
+PACKET_TYPES = (0x26, 0xB2, 0xD7)  # IR, RF 433MHz, RF 315MHz
+
+LEARNABLE_MODES = ["heat", "cool", "auto", "dry"]
+
+LEARN_COMMANDS_SCHEMA = vol.All(
+    vol.Schema({
+        vol.Required(CONF_MODEL): vol.Match(r"^[a-z0-9_-]+$"),
+        vol.Optional(CONF_NAME): cv.string,
+        vol.Optional(CONF_REMOTE): cv.entity_id,
+        vol.Inclusive(CONF_HOST, "direct"): cv.string,
+        vol.Inclusive(CONF_MAC, "direct"): cv.string,
+        vol.Optional(ATTR_DEVICE): cv.string,
+        vol.Optional(ATTR_HVAC_MODES, default=["heat", "cool"]): vol.All(
+            cv.ensure_list, [vol.In(LEARNABLE_MODES)]
+        ),
+        vol.Optional(ATTR_MIN_TEMP, default=16): vol.Coerce(int),
+        vol.Optional(ATTR_MAX_TEMP, default=30): vol.Coerce(int),
+        vol.Optional(ATTR_FAN_MODES, default=[]): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_INCLUDE_OFF, default=True): cv.boolean,
+        vol.Optional(ATTR_TIMEOUT, default=30): cv.positive_int,
+        vol.Optional(ATTR_RESTART, default=False): cv.boolean,
+    }),
+    cv.has_at_least_one_key(CONF_REMOTE, CONF_HOST),
+)
+
+
+def decode_pulses(packet):
+    """Return the pulse lengths of a Broadlink packet; raises ValueError."""
+    if len(packet) < 4 or packet[0] not in PACKET_TYPES:
+        raise ValueError("not a Broadlink IR/RF packet")
+    length = packet[2] | packet[3] << 8
+    data = packet[4:4 + length]
+    if len(data) < length:
+        raise ValueError("truncated packet")
+
+    pulses = []
+    i = 0
+    while i < len(data):
+        value = data[i]
+        i += 1
+        if value == 0:
+            # Long pulses are a zero byte followed by a big-endian 16-bit length
+            if i + 2 > len(data):
+                break
+            value = data[i] << 8 | data[i + 1]
+            i += 2
+        pulses.append(value)
+    return pulses
+
+
+def frame_signature(packet):
+    """Return a timing-tolerant signature of a captured frame.
+
+    Pulses are classified as short or long relative to the shortest
+    common pulse, which is how the bits of an AC frame are encoded, so two
+    captures of the same button compare equal despite timing jitter.
+    """
+    pulses = decode_pulses(packet)
+    if len(pulses) < MIN_PULSES:
+        raise ValueError(f"only {len(pulses)} pulses captured")
+    short = sorted(pulses)[len(pulses) // 4]
+    return bytes(1 if pulse > 2 * short else 0 for pulse in pulses)
+
+
+def iter_slots(params):
+    """Yield (command path, slot name) for every slot of the matrix."""
+    if params[ATTR_INCLUDE_OFF]:
+        yield ("off",), "off"
+    for mode in params[ATTR_HVAC_MODES]:
+        for temperature in range(params[ATTR_MIN_TEMP], params[ATTR_MAX_TEMP] + 1):
+            if params[ATTR_FAN_MODES]:
+                for fan_mode in params[ATTR_FAN_MODES]:
+                    yield (mode, str(temperature), fan_mode), f"{mode}_{temperature}_{fan_mode}"
+            else:
+                yield (mode, str(temperature)), f"{mode}_{temperature}"
+
+
+def _set_command(commands, path, command):
+    node = commands
+    for key in path[:-1]:
+        child = node.get(key)
+        if not isinstance(child, dict):
+            child = node[key] = {}
+        node = child
+    node[path[-1]] = command
+
+
+def _read_model_file(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            content = f.read()
+    except FileNotFoundError:
+        return None
+    return json.loads(content) if content.strip() else None
+
+
+def _write_model_file(path, data):
+    """Write the model file atomically so a crash never leaves half a file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def _capture_packet(device, timeout):
+    """Put the device in learning mode and wait for a code (blocking).
+
+    Returns None when no button was pressed in time. That is not a device
+    failure, so it must not raise out of the emitter pool and put the
+    shared device into backoff.
+    """
+    from broadlink.exceptions import ReadError, StorageError
+
+    device.enter_learning()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(LEARN_POLL_INTERVAL)
+        try:
+            return device.check_data()
+        except (ReadError, StorageError):
+            continue
+    return None
+
+
+class LearningSession:
+    """Learns every slot of one model, resuming from the last checkpoint."""
+
+    def __init__(self, hass, runtime, params):
+        """Initialize the session."""
+        self._hass = hass
+        self._runtime = runtime
+        self._params = params
+        self._model = params[CONF_MODEL]
+        self._device = params.get(ATTR_DEVICE, self._model)
+        self._host = params.get(CONF_HOST)
+        self._mac = params.get(CONF_MAC)
+        self._path = os.path.join(CODES_DIR, f"{self._model}.json")
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}_learn_{self._model}")
+        self._notification_id = f"{DOMAIN}_learn_{self._model}"
+        self._signatures = {}
+        self._remote_codes = None
+
+    async def async_run(self):
+        """Learn all outstanding slots."""
+        if not self._host:
+            self._remote_codes = self._remote_code_store()
+
+        checkpoint = None if self._params[ATTR_RESTART] else await self._store.async_load()
+        checkpoint = checkpoint or {"done": {}}
+        done = checkpoint["done"]
+        failed = []
+
+        model_data = await self._hass.async_add_executor_job(_read_model_file, self._path)
+        model_data = self._prepare_model_data(model_data or {})
+
+        for slot, command in done.items():
+            self._remember(slot, command)
+
+        slots = list(iter_slots(self._params))
+        for index, (path, slot) in enumerate(slots, 1):
+            if slot in done:
+                continue
+
+            persistent_notification.async_create(
+                self._hass,
+                f"Step {index} of {len(slots)}: point the remote at the Broadlink device, "
+                f"set it to **{' '.join(path)}** and press a button.",
+                title="Mitsubishi Heavy AC code learning",
+                notification_id=self._notification_id,
+            )
+
+            command = await self._async_learn_slot(slot)
+            if command is None:
+                failed.append(slot)
+                continue
+
+            _set_command(model_data["commands"], path, command)
+            done[slot] = command
+            await self._store.async_save(checkpoint)
+            await self._hass.async_add_executor_job(_write_model_file, self._path, model_data)
+
+        await self._runtime.async_reload_models()
+
+        if failed:
+            persistent_notification.async_create(
+                self._hass,
+                f"Learned {len(slots) - len(failed)} of {len(slots)} codes into {self._path}. "
+                f"Call the service again to retry: {', '.join(failed)}.",
+                title="Mitsubishi Heavy AC code learning",
+                notification_id=self._notification_id,
+            )
+        else:
+            persistent_notification.async_dismiss(self._hass, self._notification_id)
+            await self._store.async_remove()
+            _LOGGER.info("Learned %d codes into %s", len(slots), self._path)
+
+    def _prepare_model_data(self, model_data):
+        """Merge the session parameters into existing model file data."""
+        params = self._params
+        model_data.setdefault("name", params.get(CONF_NAME, self._model))
+        model_data.setdefault("commands", {})
+
+        hvac_modes = model_data.get("hvac_modes") or ["off"]
+        for mode in params[ATTR_HVAC_MODES]:
+            if mode not in hvac_modes:
+                hvac_modes.append(mode)
+        model_data["hvac_modes"] = hvac_modes
+
+        model_data["min_temp"] = min(model_data.get("min_temp", params[ATTR_MIN_TEMP]), params[ATTR_MIN_TEMP])
+        model_data["max_temp"] = max(model_data.get("max_temp", params[ATTR_MAX_TEMP]), params[ATTR_MAX_TEMP])
+        if params[ATTR_FAN_MODES]:
+            model_data["fan_modes"] = params[ATTR_FAN_MODES]
+        return model_data
+
+    def _remote_code_store(self):
+        """Return the code storage of the Broadlink remote entity."""
+        entity_id = self._params[CONF_REMOTE]
+        entry = er.async_get(self._hass).async_get(entity_id)
+        if entry is None or entry.platform != "broadlink":
+            raise HomeAssistantError(f"{entity_id} is not a Broadlink remote")
+        return Store(
+            self._hass, REMOTE_STORAGE_VERSION, f"broadlink_remote_{entry.unique_id}_codes"
+        )
+
+    async def _async_load_remote_code(self, slot):
+        """Return the code the remote has stored for a slot, if any."""
+        codes = await self._remote_codes.async_load() or {}
+        code = codes.get(self._device, {}).get(slot)
+        if isinstance(code, list):
+            # Toggle commands store one code per state
+            code = code[0] if code else None
+        return code
+
+    def _remember(self, slot, command):
+        """Record the signature of an accepted packet for duplicate checks."""
+        if not command.startswith(PACKET_PREFIX):
+            return
+        try:
+            packet = base64.b64decode(command[len(PACKET_PREFIX):])
+            self._signatures[frame_signature(packet)] = slot
+        except ValueError:
+            pass
+
+    async def _async_learn_with_remote(self, slot):
+        """Learn a slot through the remote entity and return its packet.
+
+        The remote only persists the code after a delay, so its storage is
+        polled until a code different from the previous one shows up.
+        """
+        previous = await self._async_load_remote_code(slot)
+        await self._hass.services.async_call(
+            "remote", "learn_command",
+            {
+                "entity_id": self._params[CONF_REMOTE],
+                "device": self._device,
+                "command": [slot],
+                "timeout": self._params[ATTR_TIMEOUT],
+            },
+            blocking=True,
+        )
+        deadline = time.monotonic() + REMOTE_SAVE_TIMEOUT
+        while True:
+            code = await self._async_load_remote_code(slot)
+            if code is not None and code != previous:
+                return base64.b64decode(code)
+            if time.monotonic() >= deadline:
+                raise TimeoutError("no code stored by the remote")
+            await asyncio.sleep(LEARN_POLL_INTERVAL)
+
+    async def _async_learn_slot(self, slot):
+        """Capture one slot; returns the command or None on failure."""
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                if self._host:
+                    packet = await self._runtime.emitters.async_run(
+                        self._host, self._mac, _capture_packet, self._params[ATTR_TIMEOUT]
+                    )
+                    if packet is None:
+                        raise TimeoutError("no code received")
+                else:
+                    packet = await self._async_learn_with_remote(slot)
+                signature = frame_signature(packet)
+            except TimeoutError:
+                _LOGGER.warning("No code received for %s (attempt %d)", slot, attempt)
+                continue
+            except Exception as e:
+                _LOGGER.warning("Invalid capture for %s (attempt %d): %s", slot, attempt, e)
+                continue
+
+            duplicate = self._signatures.get(signature)
+            if duplicate is not None and duplicate != slot:
+                _LOGGER.warning(
+                    "Capture for %s is identical to %s, check the remote setting (attempt %d)",
+                    slot, duplicate, attempt
+                )
+                continue
+
+            command = PACKET_PREFIX + base64.b64encode(packet).decode()
+            self._signatures[signature] = slot
+            return command
+
+        _LOGGER.error("Giving up on %s after %d attempts", slot, MAX_ATTEMPTS)
+        return None
+
+
+async def async_learn_commands(hass, runtime, params):
+    """Run a learning session; one session per model at a time."""
+    model = params[CONF_MODEL]
+    if model in runtime.learning:
+        raise HomeAssistantError(f"Already learning codes for {model}")
+    if params[ATTR_MIN_TEMP] > params[ATTR_MAX_TEMP]:
+        raise HomeAssistantError("min_temp must not be above max_temp")
+
+    runtime.learning.add(model)
+    try:
+        await LearningSession(hass, runtime, params).async_run()
+    finally:
+        runtime.learning.discard(model)
@@ -0,0 +1,227 @@
+"""Model tables for Mitsubishi Heavy AC units."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+from functools import lru_cache
+
+from .transmit import decode_packet
+
+_LOGGER = logging.getLogger(__name__)
+
+CODES_DIR = os.path.join(os.path.dirname(__file__), "codes")
+
+# Plain strings rather than the climate enums, so loading the model tables
+# does not import the climate component. They compare equal to HVACMode
+# and the FAN_*/SWING_* constants; the entity converts them.
+MODE_OFF = "off"
+MODE_FAN_ONLY = "fan_only"
+TEMPERATURE_MODES = ("heat", "cool", "auto", "dry")
+FAN_AUTO = "auto"
+
+# Default model to use if not specified
+DEFAULT_MODEL = "srk-zsx"
+
+
+@lru_cache(maxsize=None)
+def builtin_models():
+    """Return the built-in model tables, built on first use."""
+    # Example device data - this would typically come from a JSON file or other configuration
+    # In a real implementation, this could be expanded to include different models or customization options
+    return {
+        "srk-zsx": {
+            "name": "Mitsubishi Heavy SRK-ZSX",
+            "min_temp": 16,
+            "max_temp": 30,
+            "precision": 1.0,
+            "hvac_modes": ["off", "heat", "cool", "auto", "dry", "fan_only"],
+            "fan_modes": ["auto", "low", "medium", "high"],
+            "swing_modes": ["off", "on"],
+            "commands": {
+                # Example IR/RF commands for various operations - these would be the actual codes for your remote
+                "off": "OFF_COMMAND",
+                "heat": {
+                    "16": "HEAT_16_COMMAND",
+                    "17": "HEAT_17_COMMAND",
+                    "18": "HEAT_18_COMMAND",
+                    "19": "HEAT_19_COMMAND",
+                    "20": "HEAT_20_COMMAND",
+                    "21": "HEAT_21_COMMAND",
+                    "22": "HEAT_22_COMMAND",
+                    "23": "HEAT_23_COMMAND",
+                    "24": "HEAT_24_COMMAND",
+                    "25": "HEAT_25_COMMAND",
+                    "26": "HEAT_26_COMMAND",
+                    "27": "HEAT_27_COMMAND",
+                    "28": "HEAT_28_COMMAND",
+                    "29": "HEAT_29_COMMAND",
+                    "30": "HEAT_30_COMMAND"
+                },
+                "cool": {
+                    "16": "COOL_16_COMMAND",
+                    "17": "COOL_17_COMMAND",
+                    "18": "COOL_18_COMMAND",
+                    "19": "COOL_19_COMMAND",
+                    "20": "COOL_20_COMMAND",
+                    "21": "COOL_21_COMMAND",
+                    "22": "COOL_22_COMMAND",
+                    "23": "COOL_23_COMMAND",
+                    "24": "COOL_24_COMMAND",
+                    "25": "COOL_25_COMMAND",
+                    "26": "COOL_26_COMMAND",
+                    "27": "COOL_27_COMMAND",
+                    "28": "COOL_28_COMMAND",
+                    "29": "COOL_29_COMMAND",
+                    "30": "COOL_30_COMMAND"
+                },
+                "auto": {
+                    "16": "AUTO_16_COMMAND",
+                    # ... more commands
+                },
+                "dry": {
+                    "16": "DRY_16_COMMAND",
+                    # ... more commands
+                },
+                "fan_only": "FAN_ONLY_COMMAND",
+                "fan_modes": {
+                    "auto": "FAN_AUTO_COMMAND",
+                    "low": "FAN_LOW_COMMAND",
+                    "medium": "FAN_MEDIUM_COMMAND",
+                    "high": "FAN_HIGH_COMMAND"
+                },
+                "swing_modes": {
+                    "off": "SWING_OFF_COMMAND",
+                    "on": "SWING_ON_COMMAND"
+                }
+            }
+        },
+        "srk-zsp": {
+            "name": "Mitsubishi Heavy SRK-ZSP",
+            "min_temp": 18,
+            "max_temp": 30,
+            "precision": 1.0,
+            "hvac_modes": ["off", "heat", "cool", "auto", "dry"],
+            "fan_modes": ["auto", "low", "medium", "high"],
+            "swing_modes": ["off", "on"],
+            "commands": {
+                # Similar command structure but with different codes
+            }
+        }
+    }
+
+
+def load_model_tables(codes_dir=CODES_DIR):
+    """Return the built-in model tables merged with models from codes/*.json.
+
+    Each file holds one model, named after the file, in the same shape as a
+    built-in model entry. Missing keys fall back to the default model. This
+    does blocking I/O and must run in the executor.
+    """
+    builtins = builtin_models()
+    tables = dict(builtins)
+    try:
+        file_names = sorted(os.listdir(codes_dir))
+    except OSError:
+        return tables
+
+    for file_name in file_names:
+        model, ext = os.path.splitext(file_name)
+        if ext != ".json":
+            continue
+        path = os.path.join(codes_dir, file_name)
+        try:
+            with open(path, encoding="utf-8") as f:
+                content = f.read()
+            if not content.strip():
+                continue
+            data = json.loads(content)
+        except (OSError, ValueError) as err:
+            _LOGGER.error("Unable to load model file %s: %s", path, err)
+            continue
+
+        device_data = {**tables.get(model, builtins[DEFAULT_MODEL]), **data}
+        device_data.setdefault("name", model)
+        tables[model] = device_data
+
+    return tables
+
+
+class ModelEncoder:
+    """Resolves target states to remote commands for one model.
+
+    Encoders are shared by every unit of the same model, so resolved
+    transitions are cached once per model rather than per entity.
+    """
+
+    def __init__(self, device_data):
+        """Initialize the encoder."""
+        self._commands = device_data["commands"]
+        self._cache = {}
+        self._packets = {}
+
+    def _temperature_entry(self, hvac_mode, temperature):
+        if hvac_mode in TEMPERATURE_MODES:
+            mode_commands = self._commands.get(hvac_mode.lower(), {})
+            return mode_commands.get(str(int(temperature)))
+        return None
+
+    def has_fan_frames(self, hvac_mode, temperature):
+        """Return whether a mode/temperature has a full-state frame per fan mode."""
+        return isinstance(self._temperature_entry(hvac_mode, temperature), dict)
+
+    def mode_command(self, hvac_mode, temperature, fan_mode=None):
+        """Return the command for an hvac mode at a temperature."""
+        if hvac_mode == MODE_OFF:
+            return self._commands.get("off")
+        if hvac_mode in TEMPERATURE_MODES:
+            command = self._temperature_entry(hvac_mode, temperature)
+            if isinstance(command, dict):
+                # Learned per fan mode, see learning.py
+                command = command.get((fan_mode or FAN_AUTO).lower())
+            return command
+        if hvac_mode == MODE_FAN_ONLY:
+            return self._commands.get("fan_only")
+        return None
+
+    def fan_command(self, fan_mode, hvac_mode=None, temperature=None):
+        """Return the command for a fan mode, in the current mode if given."""
+        if hvac_mode is not None and self.has_fan_frames(hvac_mode, temperature):
+            return self.mode_command(hvac_mode, temperature, fan_mode)
+        return self._commands.get("fan_modes", {}).get(fan_mode.lower())
+
+    def swing_command(self, swing_mode):
+        """Return the command for a swing mode."""
+        return self._commands.get("swing_modes", {}).get(swing_mode.lower())
+
+    def packet(self, command):
+        """Return the decoded packet of a "b64:" command, or None."""
+        try:
+            return self._packets[command]
+        except KeyError:
+            packet = self._packets[command] = decode_packet(command)
+            return packet
+
+    def encode(self, hvac_mode, temperature, fan_mode=None):
+        """Return the commands for a target state, in send order."""
+        key = (hvac_mode, int(temperature), fan_mode)
+        commands = self._cache.get(key)
+        if commands is not None:
+            return commands
+
+        command = self.mode_command(hvac_mode, temperature, fan_mode)
+        if command is None:
+            raise LookupError(f"No command found for mode: {hvac_mode} at temp: {temperature}")
+        commands = [command]
+        if (
+            fan_mode is not None
+            and hvac_mode != MODE_OFF
+            and not self.has_fan_frames(hvac_mode, temperature)
+        ):
+            command = self.fan_command(fan_mode)
+            if command is None:
+                raise LookupError(f"No command found for fan mode: {fan_mode}")
+            commands.append(command)
+
+        commands = self._cache[key] = tuple(commands)
+        return commands
@@ -0,0 +1,131 @@
+"""Shared runtime data for the Mitsubishi Heavy AC integration.
+
+Everything that is expensive to build or worth sharing between units lives
+here rather than on the entities or config entries, so reloading a single
+entry reuses warm model tables, encoders, emitter connections and sensor
+listeners.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import DOMAIN
+from .models import DEFAULT_MODEL, ModelEncoder, builtin_models, load_model_tables
+from .scheduler import TimerWheel
+from .tracing import NULL_TRACER
+from .transmit import EmitterPool
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SensorSubscriptions:
+    """Shares one state listener per sensor between all units."""
+
+    def __init__(self, hass):
+        """Initialize the subscriptions."""
+        self._hass = hass
+        self._actions = {}
+        self._unsubs = {}
+
+    @callback
+    def async_subscribe(self, entity_id, action):
+        """Call action(new_state) on every state change of entity_id."""
+        actions = self._actions.setdefault(entity_id, [])
+        if not actions:
+            self._unsubs[entity_id] = async_track_state_change_event(
+                self._hass, [entity_id], self._async_dispatch
+            )
+        actions.append(action)
+
+        @callback
+        def async_unsubscribe():
+            actions.remove(action)
+            if not actions:
+                self._actions.pop(entity_id, None)
+                self._unsubs.pop(entity_id)()
+
+        return async_unsubscribe
+
+    @callback
+    def _async_dispatch(self, event):
+        new_state = event.data.get("new_state")
+        for action in list(self._actions.get(event.data["entity_id"], ())):
+            action(new_state)
+
+
+class MitsubishiHeavyRuntimeData:
+    """Integration-wide state shared by every configured unit."""
+
+    def __init__(self, hass):
+        """Initialize the runtime data."""
+        self.hass = hass
+        self.tracer = NULL_TRACER
+        self.timer_wheel = TimerWheel(hass)
+        self.sensors = SensorSubscriptions(hass)
+        self.models = None
+        self._models_lock = asyncio.Lock()
+        self._encoders = {}
+        self.emitters = EmitterPool(hass)
+        self.learning = set()
+        self._model_listeners = []
+
+    async def async_load_models(self):
+        """Load the model tables once; later calls return the cached tables."""
+        if self.models is None:
+            async with self._models_lock:
+                if self.models is None:
+                    self.models = await self.hass.async_add_executor_job(load_model_tables)
+        return self.models
+
+    async def async_reload_models(self):
+        """Reload the model tables, e.g. after a model file was written.
+
+        Listeners are called afterwards so units can swap their encoders and
+        re-encode pending transitions.
+        """
+        async with self._models_lock:
+            self.models = await self.hass.async_add_executor_job(load_model_tables)
+            self._encoders.clear()
+        for action in list(self._model_listeners):
+            action()
+        return self.models
+
+    @callback
+    def async_listen_models(self, action):
+        """Call action() after every model reload; returns an unsubscribe callback."""
+        self._model_listeners.append(action)
+
+        @callback
+        def async_unsubscribe():
+            self._model_listeners.remove(action)
+
+        return async_unsubscribe
+
+    def get_model(self, model):
+        """Return the device data for a model, or the default model."""
+        models = self.models or builtin_models()
+        device_data = models.get(model)
+        if device_data is None:
+            _LOGGER.warning("Unknown model %s, using %s", model, DEFAULT_MODEL)
+            device_data = models[DEFAULT_MODEL]
+        return device_data
+
+    def get_encoder(self, model):
+        """Return the shared encoder for a model."""
+        encoder = self._encoders.get(model)
+        if encoder is None:
+            encoder = self._encoders[model] = ModelEncoder(self.get_model(model))
+        return encoder
+
+
+@callback
+def get_runtime_data(hass):
+    """Return the integration runtime data, creating it if needed."""
+    runtime = hass.data.get(DOMAIN)
+    if runtime is None:
+        runtime = hass.data[DOMAIN] = MitsubishiHeavyRuntimeData(hass)
+    return runtime
@@ -0,0 +1,192 @@
+"""Pre-encoded scheduled transitions for Mitsubishi Heavy AC units.
+
+Commands for a transition are resolved when the schedule is created, so a
+timer firing only has to hand the stored commands to the emitter. Units
+sharing an emitter are staggered so their IR frames do not collide, and
+all transitions are driven from one timer wheel with a single armed
+loop timer for the whole integration.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+from datetime import timedelta
+
+import homeassistant.util.dt as dt_util
+
+from .tracing import detached_context
+
+_LOGGER = logging.getLogger(__name__)
+
+# Resolution of the wheel; transitions in the same tick fire together
+TICK_SECONDS = 0.1
+# Gap between transitions sent through the same emitter
+STAGGER_SECONDS = 1.0
+# How far a stagger search looks before giving up and sharing a slot
+MAX_STAGGER_SLOTS = 600
+
+
+class ScheduledTransition:
+    """A target state with its commands already resolved."""
+
+    def __init__(self, entity, at, hvac_mode, temperature, fan_mode, commands, daily):
+        """Initialize the transition."""
+        self.id = None
+        self.entity = entity
+        self.at = at
+        self.hvac_mode = hvac_mode
+        self.temperature = temperature
+        self.fan_mode = fan_mode
+        self.commands = commands
+        self.daily = daily
+        self.fire_time = None
+        self.cancelled = False
+
+    @property
+    def emitter(self):
+        """Return the key of the emitter the commands are sent through."""
+        return self.entity.emitter
+
+    def as_dict(self):
+        """Return the transition as a state attribute."""
+        return {
+            "at": self.at.isoformat(),
+            "fire_time": dt_util.as_local(self.fire_time).isoformat(),
+            "hvac_mode": self.hvac_mode,
+            "temperature": self.temperature,
+            "fan_mode": self.fan_mode,
+            "daily": self.daily,
+        }
+
+
+def next_occurrence(at, now=None):
+    """Return the next UTC datetime at which the local time `at` occurs."""
+    now = now or dt_util.now()
+    candidate = now.replace(
+        hour=at.hour, minute=at.minute, second=at.second, microsecond=0
+    )
+    if candidate <= now:
+        candidate += timedelta(days=1)
+    return dt_util.as_utc(candidate)
+
+
+class TimerWheel:
+    """Fires scheduled transitions for every unit of the integration.
+
+    Transitions are bucketed by tick; a heap of occupied ticks lets the
+    wheel keep exactly one loop timer armed for the earliest bucket.
+    """
+
+    def __init__(self, hass):
+        """Initialize the wheel."""
+        self._hass = hass
+        self._buckets = {}
+        self._ticks = []
+        self._handle = None
+        self._armed_tick = None
+        self._slots = {}
+        self._ids = itertools.count(1)
+
+    def schedule(self, transition, first_fire=None):
+        """Add a transition, staggering it against its emitter."""
+        if transition.id is None:
+            transition.id = next(self._ids)
+        requested = first_fire or next_occurrence(transition.at)
+        transition.fire_time = self._reserve_slot(transition.emitter, requested)
+        tick = self._tick_for(transition.fire_time)
+
+        bucket = self._buckets.get(tick)
+        if bucket is None:
+            bucket = self._buckets[tick] = []
+            heapq.heappush(self._ticks, tick)
+        bucket.append(transition)
+
+        if self._armed_tick is None or tick < self._armed_tick:
+            self._arm()
+        return transition
+
+    def cancel(self, transition):
+        """Cancel a transition; its bucket entry is skipped when fired."""
+        transition.cancelled = True
+        self._release_slot(transition)
+
+    def async_shutdown(self):
+        """Cancel the armed timer."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+            self._armed_tick = None
+
+    def _slot_key(self, fire_time):
+        return int(fire_time.timestamp() // STAGGER_SECONDS)
+
+    def _reserve_slot(self, emitter, requested):
+        """Return the first free fire time for the emitter at or after requested."""
+        occupied = self._slots.setdefault(emitter, set())
+        base = self._slot_key(requested)
+        for offset in range(MAX_STAGGER_SLOTS):
+            if base + offset not in occupied:
+                break
+        else:
+            _LOGGER.warning("No free transmit slot for %s near %s", emitter, requested)
+            offset = 0
+        occupied.add(base + offset)
+        return requested + timedelta(seconds=offset * STAGGER_SECONDS)
+
+    def _release_slot(self, transition):
+        occupied = self._slots.get(transition.emitter)
+        if occupied is not None and transition.fire_time is not None:
+            occupied.discard(self._slot_key(transition.fire_time))
+
+    def _tick_for(self, fire_time):
+        return int(fire_time.timestamp() / TICK_SECONDS)
+
+    def _arm(self):
+        """Arm the loop timer for the earliest occupied tick."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+            self._armed_tick = None
+        if not self._ticks:
+            return
+        tick = self._ticks[0]
+        delay = tick * TICK_SECONDS - dt_util.utcnow().timestamp()
+        loop = self._hass.loop
+        self._armed_tick = tick
+        # loop.call_at would capture the context of whatever armed the wheel,
+        # such as a setup span, and every fired transition would join it
+        self._handle = loop.call_at(
+            loop.time() + max(delay, 0), self._fire, context=detached_context()
+        )
+
+    def _fire(self):
+        """Dispatch every bucket that is due."""
+        self._handle = None
+        self._armed_tick = None
+        now_tick = self._tick_for(dt_util.utcnow())
+        while self._ticks and self._ticks[0] <= now_tick:
+            tick = heapq.heappop(self._ticks)
+            for transition in self._buckets.pop(tick, ()):
+                if transition.cancelled:
+                    continue
+                self._release_slot(transition)
+                self._hass.async_create_task(
+                    transition.entity.async_fire_transition(transition)
+                )
+                if transition.daily:
+                    self.schedule(
+                        transition,
+                        next_occurrence(transition.at, dt_util.as_local(transition.fire_time)),
+                    )
+        self._arm()
+
+
+def parse_restored(value):
+    """Return (at, fire_time) from a restored transition attribute."""
+    at = dt_util.parse_time(value.get("at", ""))
+    fire_time = dt_util.parse_datetime(value.get("fire_time", ""))
+    if fire_time is not None:
+        fire_time = dt_util.as_utc(fire_time)
+    return at, fire_time
+
@@ -0,0 +1,205 @@
+"""Opt-in tracing for the Mitsubishi Heavy AC command pipeline.
+
+Spans are written as Chrome trace events (JSON array format) so a trace
+file can be opened directly in chrome://tracing or Perfetto. Every span
+started while handling one climate command shares a correlation ID, which
+is also used as the trace "thread" so each command gets its own lane.
+"""
+from __future__ import annotations
+
+import contextvars
+import itertools
+import json
+import logging
+import os
+import queue
+import time
+from contextlib import nullcontext
+from logging.handlers import QueueListener, RotatingFileHandler
+
+from .const import (
+    DEFAULT_TRACE_BACKUP_COUNT,
+    DEFAULT_TRACE_MAX_BYTES,
+    DEFAULT_TRACE_PATH,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_NULL_SPAN = nullcontext()
+_correlation_ids = itertools.count(1)
+_correlation_id = contextvars.ContextVar(
+    "mitsubishi_heavy_ac_correlation_id", default=None
+)
+
+
+def detached_context():
+    """Return a copy of the current context without a correlation ID.
+
+    Callbacks run in it start their own trace lane instead of joining the
+    span that scheduled them.
+    """
+    context = contextvars.copy_context()
+    context.run(_correlation_id.set, None)
+    return context
+
+
+class _ChromeTraceFormatter(logging.Formatter):
+    """Serialise a trace event, off the event loop, in the listener thread."""
+
+    def format(self, record):
+        return json.dumps(record.msg, separators=(",", ":"))
+
+
+class _ChromeTraceFileHandler(RotatingFileHandler):
+    """Rotating file handler that keeps every file a loadable trace array.
+
+    The JSON array format allows the closing bracket and a trailing comma
+    to be omitted, so events can simply be appended.
+    """
+
+    terminator = ",\n"
+
+    def _open(self):
+        stream = super()._open()
+        if stream.tell() == 0:
+            stream.write("[\n")
+        return stream
+
+
+class _Span:
+    """A single complete ("X") trace event."""
+
+    __slots__ = ("_tracer", "_name", "_cat", "_args", "_root", "_token", "_start")
+
+    def __init__(self, tracer, name, cat, root, args):
+        self._tracer = tracer
+        self._name = name
+        self._cat = cat
+        self._root = root
+        self._args = args
+        self._token = None
+        self._start = 0
+
+    def __enter__(self):
+        if self._root and _correlation_id.get() is None:
+            self._token = _correlation_id.set(next(_correlation_ids))
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        correlation_id = _correlation_id.get()
+        args = self._args
+        args["correlation_id"] = correlation_id
+        if exc_type is not None:
+            args["error"] = exc_type.__name__
+        self._tracer.emit({
+            "name": self._name,
+            "cat": self._cat,
+            "ph": "X",
+            "ts": self._start // 1000,
+            "dur": (end - self._start) // 1000,
+            "pid": self._tracer.pid,
+            "tid": correlation_id or 0,
+            "args": args,
+        })
+        if self._token is not None:
+            _correlation_id.reset(self._token)
+        return False
+
+
+class Tracer:
+    """Collects trace spans and writes them to a rotating local file.
+
+    When disabled, span() returns a shared no-op context manager so the
+    cost on the command path is a single attribute check.
+    """
+
+    def __init__(
+        self,
+        path=DEFAULT_TRACE_PATH,
+        max_bytes=DEFAULT_TRACE_MAX_BYTES,
+        backup_count=DEFAULT_TRACE_BACKUP_COUNT,
+        profile_setup=False,
+    ):
+        """Initialize the tracer."""
+        self.enabled = False
+        self.profile_setup = profile_setup
+        self.pid = os.getpid()
+        self._path = path
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        self._queue = queue.SimpleQueue()
+        self._listener = None
+        self._profiler = None
+
+    def span(self, name, cat="command", root=False, **args):
+        """Return a context manager timing one stage of the pipeline.
+
+        A root span starts a new correlation ID unless one is already set
+        for the current task.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, root, args)
+
+    def emit(self, event):
+        """Queue an event for the writer thread."""
+        self._queue.put_nowait(logging.makeLogRecord({"msg": event}))
+
+    def start(self):
+        """Start writing trace events."""
+        if self._listener is not None:
+            return
+        handler = _ChromeTraceFileHandler(
+            self._path,
+            maxBytes=self._max_bytes,
+            backupCount=self._backup_count,
+            delay=True,
+        )
+        handler.setFormatter(_ChromeTraceFormatter())
+        self._listener = QueueListener(self._queue, handler)
+        self._listener.start()
+        self.enabled = True
+        _LOGGER.info("Tracing enabled, writing to %s", self._path)
+
+    def stop(self):
+        """Stop tracing and flush queued events (blocking)."""
+        self.enabled = False
+        listener, self._listener = self._listener, None
+        if listener is None:
+            return
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        _LOGGER.info("Tracing disabled")
+
+    async def async_set_enabled(self, hass, enabled):
+        """Toggle tracing at runtime."""
+        if enabled:
+            self.start()
+        else:
+            await hass.async_add_executor_job(self.stop)
+
+    def start_profile(self):
+        """Start a cProfile capture of the event loop thread."""
+        if self._profiler is not None:
+            return
+        import cProfile
+
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+
+    async def async_stop_profile(self, hass):
+        """Stop the capture and dump it next to the trace file."""
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return
+        profiler.disable()
+        path = f"{os.path.splitext(self._path)[0]}_setup.prof"
+        await hass.async_add_executor_job(profiler.dump_stats, path)
+        _LOGGER.info("Setup profile written to %s", path)
+
+
+NULL_TRACER = Tracer()
+
@@ -0,0 +1,126 @@
+"""Direct transmission of pre-encoded packets to Broadlink devices."""
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+TRANSMIT_SERVICE = "service"
+TRANSMIT_DIRECT = "direct"
+TRANSMIT_MODES = [TRANSMIT_SERVICE, TRANSMIT_DIRECT]
+
+PACKET_PREFIX = "b64:"
+
+# Keep an unreachable device from stalling a command for long, and stop
+# retrying it on every command for a while after it failed
+DEVICE_TIMEOUT = 3
+BACKOFF_SECONDS = 60
+
+
+def decode_packet(command):
+    """Return the raw packet of a "b64:" command, or None for learned names."""
+    if not command.startswith(PACKET_PREFIX):
+        return None
+    try:
+        return base64.b64decode(command[len(PACKET_PREFIX):], validate=True)
+    except (binascii.Error, ValueError):
+        _LOGGER.error("Invalid base64 packet in command: %s", command)
+        return None
+
+
+class EmitterPool:
+    """Pooled, authenticated Broadlink devices shared by all units.
+
+    A Broadlink device handles one request at a time, so sends to the same
+    device are serialised with a lock and run in the executor. A device that
+    failed is reported as backing off for BACKOFF_SECONDS so callers with
+    another path can skip it.
+    """
+
+    def __init__(self, hass):
+        """Initialize the pool."""
+        self._hass = hass
+        self._devices = {}
+        self._locks = {}
+        self._failed_at = {}
+
+    def is_backing_off(self, host, mac):
+        """Return True while a device is in its backoff window after a failure."""
+        failed_at = self._failed_at.get((host, mac))
+        return failed_at is not None and time.monotonic() - failed_at < BACKOFF_SECONDS
+
+    async def async_get(self, host, mac):
+        """Return a connected device, connecting on first use."""
+        key = (host, mac)
+        device = self._devices.get(key)
+        if device is None:
+            # Imported here so setups using a remote entity never load broadlink
+            from .utils import get_broadlink_device
+
+            device = await get_broadlink_device(self._hass, host, mac, DEVICE_TIMEOUT)
+            if device is not None:
+                self._devices[key] = device
+        return device
+
+    def invalidate(self, host, mac):
+        """Drop a device so the next send reconnects, and start its backoff."""
+        self._devices.pop((host, mac), None)
+        self._failed_at[(host, mac)] = time.monotonic()
+
+    async def async_run(self, host, mac, job, *args):
+        """Run job(device, *args) in the executor while holding the device."""
+        lock = self._locks.setdefault((host, mac), asyncio.Lock())
+        async with lock:
+            device = await self.async_get(host, mac)
+            if device is None:
+                self.invalidate(host, mac)
+                raise ConnectionError(f"Broadlink device at {host} is unavailable")
+            try:
+                result = await self._hass.async_add_executor_job(job, device, *args)
+            except Exception:
+                self.invalidate(host, mac)
+                raise
+            self._failed_at.pop((host, mac), None)
+            return result
+
+    async def async_send_packet(self, host, mac, packet):
+        """Send a packet straight to a device; raises on failure."""
+        await self.async_run(host, mac, _send_data, packet)
+
+
+def _send_data(device, packet):
+    device.send_data(packet)
+
+
+class TransmitStats:
+    """Latency of each transmit path, for comparing direct and service sends."""
+
+    def __init__(self):
+        """Initialize the stats."""
+        self._paths = {}
+        self.fallbacks = 0
+
+    def record(self, path, started):
+        """Record a send on a path that started at perf_counter() `started`."""
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        stats = self._paths.setdefault(path, {"count": 0, "total_ms": 0.0, "last_ms": 0.0})
+        stats["count"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["last_ms"] = elapsed_ms
+
+    def as_dict(self):
+        """Return the stats as a state attribute."""
+        result = {
+            path: {
+                "count": stats["count"],
+                "last_ms": round(stats["last_ms"], 1),
+                "avg_ms": round(stats["total_ms"] / stats["count"], 1),
+            }
+            for path, stats in self._paths.items()
+        }
+        result["fallbacks"] = self.fallbacks
+        return result
@@ -1,20 +1,26 @@
 """Utility functions for Mitsubishi Heavy Industries AC."""
+import functools
 import logging
-import broadlink
 
 _LOGGER = logging.getLogger(__name__)
 
-async def get_broadlink_device(hass, host, mac):
-    """Get a Broadlink device."""
+async def get_broadlink_device(hass, host, mac, timeout=10):
+    """Get a Broadlink device whose requests time out after `timeout` seconds."""
+    # Imported on first use; setups that only use a remote entity never need it
+    import broadlink
+
     try:
         # Convert MAC string to bytes
         mac_addr = bytes.fromhex(mac.replace(':', ''))
         
         # Try to connect to the device
-        device = broadlink.hello(host)
+        device = await hass.async_add_executor_job(
+            functools.partial(broadlink.hello, host, timeout=timeout)
+        )
         if device is None:
             _LOGGER.error("Failed to connect to Broadlink device at %s", host)
             return None
+        device.timeout = timeout
             
         # Authenticate
         await hass.async_add_executor_job(device.auth)
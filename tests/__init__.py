@@ -0,0 +1 @@
+"""Tests for the Mitsubishi Heavy AC integration."""
@@ -0,0 +1,71 @@
+"""Tests for decoding and validating learned codes."""
+import pytest
+
+from custom_components.mitsubishi_heavy_ac.learning import (
+    MIN_PULSES,
+    decode_pulses,
+    frame_signature,
+)
+
+
+def _packet(pulses, packet_type=0x26):
+    """Build a Broadlink IR packet from pulse lengths."""
+    data = bytearray()
+    for pulse in pulses:
+        if pulse > 0xFF:
+            data += bytes([0, pulse >> 8, pulse & 0xFF])
+        else:
+            data.append(pulse)
+    return bytes([packet_type, 0, len(data) & 0xFF, len(data) >> 8]) + bytes(data)
+
+
+def _frame(bits, short=20, long=60):
+    """Return the pulses of a frame: a header, then a mark and a space per bit."""
+    pulses = [300, 150]
+    for bit in bits:
+        pulses += [short, long if bit else short]
+    return pulses
+
+
+BITS = [1, 0, 0, 1, 1, 0, 1, 0] * 4
+
+
+def test_decode_pulses_round_trip():
+    """Short and long pulses decode back to their lengths."""
+    pulses = [300, 150, 20, 60, 20, 20]
+    assert decode_pulses(_packet(pulses)) == pulses
+
+
+def test_decode_pulses_long_pulse_encoding():
+    """Pulses over 255 are a zero byte and a big-endian 16-bit length."""
+    assert decode_pulses(bytes([0x26, 0, 4, 0, 0, 0x01, 0x2C, 20])) == [300, 20]
+
+
+def test_decode_pulses_rejects_bad_packets():
+    """Truncated or non-IR/RF packets raise ValueError."""
+    packet = _packet(_frame(BITS))
+    with pytest.raises(ValueError):
+        decode_pulses(packet[:-5])
+    with pytest.raises(ValueError):
+        decode_pulses(packet[:3])
+    with pytest.raises(ValueError):
+        decode_pulses(bytes([0x01]) + packet[1:])
+
+
+def test_frame_signature_tolerates_jitter():
+    """Two captures of the same button compare equal despite timing jitter."""
+    jittered = [pulse + (3 if i % 3 else -2) for i, pulse in enumerate(_frame(BITS))]
+    assert frame_signature(_packet(_frame(BITS))) == frame_signature(_packet(jittered))
+
+
+def test_frame_signature_distinguishes_frames():
+    """A frame with different bits has a different signature."""
+    other = list(BITS)
+    other[5] = 1 - other[5]
+    assert frame_signature(_packet(_frame(BITS))) != frame_signature(_packet(_frame(other)))
+
+
+def test_frame_signature_rejects_short_captures():
+    """Captures with too few pulses are treated as truncated."""
+    with pytest.raises(ValueError):
+        frame_signature(_packet([20, 60] * (MIN_PULSES // 2 - 1)))
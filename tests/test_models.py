@@ -0,0 +1,53 @@
+"""Tests for the model tables and encoder."""
+import pytest
+
+from custom_components.mitsubishi_heavy_ac.models import ModelEncoder
+
+DEVICE_DATA = {
+    "commands": {
+        "off": "OFF",
+        "heat": {
+            "21": "HEAT_21",
+            "22": {"auto": "HEAT_22_AUTO", "low": "HEAT_22_LOW"},
+        },
+        "fan_modes": {"auto": "FAN_AUTO", "low": "FAN_LOW"},
+    }
+}
+
+
+@pytest.fixture
+def encoder():
+    """Return an encoder for the test model."""
+    return ModelEncoder(DEVICE_DATA)
+
+
+def test_encode_off_ignores_fan_mode(encoder):
+    """Off is a single frame whatever the fan mode."""
+    assert encoder.encode("off", 21, "low") == ("OFF",)
+
+
+def test_encode_appends_fan_command(encoder):
+    """Models without per-fan frames send the fan command after the mode."""
+    assert encoder.encode("heat", 21) == ("HEAT_21",)
+    assert encoder.encode("heat", 21, "low") == ("HEAT_21", "FAN_LOW")
+
+
+def test_encode_uses_per_fan_frames(encoder):
+    """Full-state frames already carry the fan mode."""
+    assert encoder.encode("heat", 22, "low") == ("HEAT_22_LOW",)
+    assert encoder.encode("heat", 22) == ("HEAT_22_AUTO",)
+
+
+def test_encode_is_cached_per_whole_degree(encoder):
+    """Fractional temperatures share the resolved commands of their degree."""
+    assert encoder.encode("heat", 21.5, "low") is encoder.encode("heat", 21, "low")
+
+
+def test_encode_missing_commands(encoder):
+    """Unknown states raise LookupError."""
+    with pytest.raises(LookupError):
+        encoder.encode("heat", 25)
+    with pytest.raises(LookupError):
+        encoder.encode("cool", 21)
+    with pytest.raises(LookupError):
+        encoder.encode("heat", 21, "high")
@@ -0,0 +1,79 @@
+"""Tests for scheduled transitions and the timer wheel."""
+import asyncio
+from datetime import datetime, time, timedelta
+from types import SimpleNamespace
+
+import homeassistant.util.dt as dt_util
+
+from custom_components.mitsubishi_heavy_ac.scheduler import (
+    STAGGER_SECONDS,
+    ScheduledTransition,
+    TimerWheel,
+    next_occurrence,
+)
+
+NOW = datetime(2026, 1, 1, 7, 0, tzinfo=dt_util.UTC)
+
+
+class FakeEntity:
+    """Records fired transitions."""
+
+    def __init__(self, emitter):
+        self.emitter = emitter
+        self.fired = []
+
+    async def async_fire_transition(self, transition):
+        self.fired.append(transition)
+
+
+def _transition(entity, at=time(7, 30)):
+    return ScheduledTransition(entity, at, "heat", 21, None, ("HEAT_21",), False)
+
+
+def test_next_occurrence_later_today():
+    """A time still ahead today fires today."""
+    assert next_occurrence(time(7, 30), NOW) == NOW.replace(minute=30)
+
+
+def test_next_occurrence_tomorrow():
+    """A time already passed, or the current time, fires tomorrow."""
+    assert next_occurrence(time(6, 30), NOW) == NOW.replace(hour=6, minute=30) + timedelta(days=1)
+    assert next_occurrence(time(7, 0), NOW) == NOW + timedelta(days=1)
+
+
+def test_reserve_slot_staggers_shared_emitter():
+    """Transitions on one emitter are spread out; other emitters are not."""
+    wheel = TimerWheel(None)
+    requested = NOW.replace(minute=30)
+    assert wheel._reserve_slot("remote.a", requested) == requested
+    assert wheel._reserve_slot("remote.a", requested) == requested + timedelta(seconds=STAGGER_SECONDS)
+    assert wheel._reserve_slot("remote.a", requested) == requested + timedelta(seconds=2 * STAGGER_SECONDS)
+    assert wheel._reserve_slot("remote.b", requested) == requested
+
+
+def test_cancel_releases_slot():
+    """A cancelled transition frees its slot for the next one."""
+    wheel = TimerWheel(None)
+    requested = NOW.replace(minute=30)
+    transition = _transition(SimpleNamespace(emitter="remote.a"))
+    transition.fire_time = wheel._reserve_slot("remote.a", requested)
+
+    wheel.cancel(transition)
+
+    assert transition.cancelled
+    assert wheel._reserve_slot("remote.a", requested) == requested
+
+
+async def test_fire_releases_slot(hass):
+    """A fired transition is handed to its entity and frees its slot."""
+    wheel = TimerWheel(hass)
+    entity = FakeEntity("remote.a")
+    requested = dt_util.utcnow()
+    transition = wheel.schedule(_transition(entity), requested)
+
+    await asyncio.sleep(0)
+    await hass.async_block_till_done()
+
+    assert entity.fired == [transition]
+    assert wheel._reserve_slot("remote.a", requested) == requested
+    wheel.async_shutdown()
@@ -0,0 +1,106 @@
+"""Startup latency budgets for the Mitsubishi Heavy AC integration."""
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from homeassistant.setup import async_setup_component
+
+COMPONENT = "custom_components.mitsubishi_heavy_ac"
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+# Budgets for a Pi-class host; CI runners are faster, so these leave headroom
+IMPORT_BUDGET_MS = 100
+SETUP_BUDGET_MS_PER_ENTITY = 20
+ENTITIES = 50
+
+# The first run also compiles the modules to .pyc and warms the file cache,
+# so it is discarded and the median of the remaining runs is compared
+IMPORT_RUNS = 5
+
+# Modules Home Assistant has already imported by the time it loads the
+# integration; importing them first keeps them out of our measurement
+HA_PRELOAD = [
+    "homeassistant.core",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.helpers.restore_state",
+    "homeassistant.components.climate",
+]
+
+
+# Only loaded when direct transmit or the learning service is used
+LAZY_MODULES = ["broadlink", f"{COMPONENT}.learning"]
+
+
+def _measure_import_time():
+    """Return the cumulative import time in ms of the integration modules."""
+    code = "; ".join(
+        [f"import {module}" for module in HA_PRELOAD]
+        + [f"import {COMPONENT}", f"import {COMPONENT}.climate", "import sys"]
+        + [f"assert {module!r} not in sys.modules, '{module} imported eagerly'" for module in LAZY_MODULES]
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    # Lines look like "import time: self [us] | cumulative | imported package"
+    # and are printed children first; the indentation of the name gives the
+    # nesting. Walking them in reverse visits parents before children, so
+    # each of our modules is counted once, at its outermost import.
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            entries.append((len(name) - len(name.lstrip()), name.strip(), int(cumulative)))
+        except ValueError:
+            continue
+
+    total_us = 0
+    ancestors = []
+    for depth, name, cumulative in reversed(entries):
+        while ancestors and ancestors[-1][0] >= depth:
+            ancestors.pop()
+        ours = name.startswith(COMPONENT)
+        if ours and not (ancestors and ancestors[-1][1]):
+            total_us += cumulative
+        ancestors.append((depth, ours or bool(ancestors and ancestors[-1][1])))
+    return total_us / 1000
+
+
+def test_import_budget():
+    """The integration's own modules import within the budget."""
+    _measure_import_time()
+    import_ms = statistics.median(_measure_import_time() for _ in range(IMPORT_RUNS))
+    assert import_ms <= IMPORT_BUDGET_MS, (
+        f"Import took {import_ms:.1f} ms (budget {IMPORT_BUDGET_MS} ms)"
+    )
+
+
+async def test_setup_budget(hass, enable_custom_integrations):
+    """Setting up many YAML units stays within the per-entity budget."""
+    config = {
+        "climate": [
+            {"platform": "mitsubishi_heavy_ac", "unique_id": f"bench_{i}", "name": f"Bench {i}"}
+            for i in range(ENTITIES)
+        ]
+    }
+    start = time.perf_counter()
+    assert await async_setup_component(hass, "climate", config)
+    await hass.async_block_till_done()
+    setup_ms = (time.perf_counter() - start) * 1000
+
+    assert len(hass.states.async_entity_ids("climate")) == ENTITIES
+    budget_ms = SETUP_BUDGET_MS_PER_ENTITY * ENTITIES
+    assert setup_ms <= budget_ms, (
+        f"Setup of {ENTITIES} entities took {setup_ms:.1f} ms (budget {budget_ms} ms)"
+    )